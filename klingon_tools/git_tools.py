@@ -115,6 +115,51 @@ def git_get_toplevel() -> Optional[Repo]:
         return None
 
 
+def _parse_porcelain_status(
+        output: str) -> Tuple[list, list, list, list]:
+    """Parses the output of ``git status --porcelain=v2 -z``.
+
+    Args:
+        output: The NUL separated status records.
+
+    Returns:
+        A tuple containing lists of files deleted from the working tree,
+        untracked files, files modified in the working tree and staged files.
+    """
+    deleted_files = []
+    untracked_files = []
+    modified_files = []
+    staged_files = []
+
+    records = iter(output.split("\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == "?":
+            untracked_files.append(record[2:])
+            continue
+        if kind == "1":
+            fields = record.split(" ", 8)
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            # Renames and copies are followed by the original path
+            next(records, None)
+        elif kind == "u":
+            fields = record.split(" ", 10)
+        else:
+            continue
+
+        index_status, worktree_status = fields[1]
+        path = fields[-1]
+        if index_status != ".":
+            staged_files.append(path)
+        if worktree_status == "D":
+            deleted_files.append(path)
+        elif worktree_status == "M":
+            modified_files.append(path)
+
+    return deleted_files, untracked_files, modified_files, staged_files
+
+
 def git_get_status(repo: Repo) -> Tuple[list, list, list, list, list]:
     """Retrieves the current status of the git repository.
 
@@ -129,30 +174,18 @@ def git_get_status(repo: Repo) -> Tuple[list, list, list, list, list]:
         A tuple containing lists of deleted files, untracked files, modified
         files, staged files, and committed but not pushed files.
     """
-    deleted_files = []
-    untracked_files = []
-    modified_files = []
-    staged_files = []
-    committed_not_pushed = []
-
     # Get the current branch of the repository
     current_branch = repo.active_branch
 
-    # Initialize lists to store the status of files
-    deleted_files = [
-        item.a_path
-        for item in repo.index.diff(None)
-        if item.change_type == "D"
-    ]
-    untracked_files = repo.untracked_files
-    modified_files = [
-        item.a_path
-        for item in repo.index.diff(None)
-        if item.change_type == "M"
-    ]
-    staged_files = [
-        item.a_path for item in repo.index.diff("HEAD")
-    ]  # List of staged files
+    # Collect the working tree and index status with a single git call
+    (
+        deleted_files,
+        untracked_files,
+        modified_files,
+        staged_files,
+    ) = _parse_porcelain_status(
+        repo.git.status("--porcelain=v2", "-z", "--untracked-files=all")
+    )
     committed_not_pushed = []  # List of committed but not pushed files
 
     try:
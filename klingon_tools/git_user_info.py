@@ -9,6 +9,7 @@ Example:
     user_name, user_email = get_git_user_info()
 """
 
+import functools
 import os
 import subprocess
 from typing import Tuple
@@ -16,6 +17,7 @@ from git import GitCommandError
 from klingon_tools.log_msg import log_message
 
 
+@functools.lru_cache(maxsize=1)
 def get_git_user_info() -> Tuple[str, str]:
     """Retrieves the user's name and email from git configuration.
 
@@ -23,6 +25,10 @@ def get_git_user_info() -> Tuple[str, str]:
     configuration. If the values are not set or are set to default values,
     it logs an error and raises an exception.
 
+    The result is cached for the life of the process, so git is only asked
+    once. Errors are not cached. Call ``get_git_user_info.cache_clear()`` to
+    force a fresh lookup.
+
     Returns:
         A tuple containing the user's name and email.
 
@@ -166,7 +166,9 @@ def _restore_output(suppress_output, captured_output=None):
 def ktest_entrypoint(args=None):
     """Entrypoint for running ktest as a script."""
     parser = argparse.ArgumentParser(description="Run ktest")
-    parser.add_argument("--no-llm", action="store_true", help="Skip LLM tests")
+    parser.add_argument(
+        "--no-llm", action="store_true", help="Replay recorded LLM answers"
+    )
     parser.add_argument("--loglevel", default="INFO", help="Set the log level")
     parsed_args = parser.parse_args(args)
 
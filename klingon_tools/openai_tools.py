@@ -1,4 +1,5 @@
 import os
+import re
 import subprocess
 import textwrap
 
@@ -11,6 +12,25 @@ from klingon_tools.git_unstage import git_unstage_files
 from klingon_tools.git_log_helper import get_commit_log
 from klingon_tools.git_stage import git_stage_diff
 
+# Matches the "type(scope)" header of a conventional commit message
+_COMMIT_TYPE_SCOPE_RE = re.compile(r"([^()]*)\(([^()]*)\)+")
+
+# Emoji prepended to each conventional commit type by format_message
+_EMOJI_PREFIX = {
+    "build": "🛠️",
+    "chore": "🔧",
+    "ci": "⚙️",
+    "docs": "📚",
+    "feat": "✨",
+    "fix": "🐛",
+    "perf": "🚀",
+    "refactor": "♻️",
+    "revert": "⏪",
+    "style": "💄",
+    "test": "🚨",
+    "other": "👾",
+}
+
 
 class OpenAITools:
     def __init__(self, debug: bool = False) -> None:
@@ -201,38 +221,25 @@ class OpenAITools:
         )
 
         try:
-            parts = commit_message.split(":")
-            if len(parts) < 2:
+            commit_type_scope, separator, description = (
+                commit_message.partition(":")
+            )
+            if not separator:
                 raise ValueError(
                     "Commit message format is incorrect. Expected format: "
                     "type(scope): description"
                 )
 
-            commit_type_scope = parts[0]
-
-            if "(" in commit_type_scope and ")" in commit_type_scope:
-                commit_type, commit_scope = commit_type_scope.split("(")
-                commit_scope = commit_scope.rstrip(")")
+            match = _COMMIT_TYPE_SCOPE_RE.fullmatch(commit_type_scope)
+            if match:
+                commit_type, commit_scope = match.groups()
             else:
                 raise ValueError(
                     "Commit message must include a scope in the format "
                     "type(scope): description"
                 )
 
-            emoticon_prefix = {
-                "build": "🛠️",
-                "chore": "🔧",
-                "ci": "⚙️",
-                "docs": "📚",
-                "feat": "✨",
-                "fix": "🐛",
-                "perf": "🚀",
-                "refactor": "♻️",
-                "revert": "⏪",
-                "style": "💄",
-                "test": "🚨",
-                "other": "👾",
-            }.get(commit_type, "")
+            emoticon_prefix = _EMOJI_PREFIX.get(commit_type, "")
         except ValueError as e:
             self.log_message.error(f"Commit message format error: {e}")
             raise
@@ -242,7 +249,7 @@ class OpenAITools:
 
         formatted_message = (
             f"{emoticon_prefix} {commit_type}({commit_scope}): "
-            f"{commit_message.split(':', 1)[1].strip()}"
+            f"{description.strip()}"
         )
 
         return formatted_message
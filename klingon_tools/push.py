@@ -18,13 +18,19 @@ Attributes:
     committed_not_pushed (list): List of committed but not pushed files.
 """
 
+from dataclasses import dataclass, replace
 from git import Repo
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Pattern, Tuple
 import argparse
+import asyncio
+import fnmatch
+import functools
 import glob
+import itertools
 import os
 import re
 import requests
+import shutil
 import subprocess
 import sys
 import logging
@@ -53,6 +59,24 @@ modified_files: List[str] = []
 staged_files: List[str] = []
 committed_not_pushed: List[str] = []
 
+
+@dataclass(frozen=True)
+class GitChanges:
+    """The file lists that process_changes works through.
+
+    Attributes:
+        deleted: Deleted files, committed before anything else.
+        untracked: Untracked files to stage and commit.
+        modified: Modified files to stage and commit.
+        committed_not_pushed: Files committed but not yet pushed.
+    """
+
+    deleted: Tuple[str, ...] = ()
+    untracked: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    committed_not_pushed: Tuple[str, ...] = ()
+
+
 # Suppress logs for common HTTP libraries
 # logging.getLogger("urllib3").setLevel(logging.WARNING)
 # logging.getLogger("requests").setLevel(logging.WARNING)
@@ -65,6 +89,14 @@ logging.basicConfig(
 )
 
 
+_SEMVER_RE = re.compile(
+    r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
+    r'(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*'
+    r')(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
+    r'(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$'
+)
+
+
 def is_valid_semver(version: str) -> bool:
     """
     Validate if a given version string follows semver guidelines, including
@@ -76,13 +108,7 @@ def is_valid_semver(version: str) -> bool:
     Returns:
         bool: True if the version is valid, False otherwise.
     """
-    pattern = (
-        r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
-        r'(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*'
-        r')(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
-        r'(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$'
-    )
-    match = re.match(pattern, version)
+    match = _SEMVER_RE.match(version)
     is_valid = bool(match)
     print(f"Validating version: {version}")
     print(f"Is valid: {is_valid}")
@@ -105,12 +131,14 @@ def find_git_root(start_path: str) -> Optional[str]:
     Returns:
         The path to the root of the git repository, or None if not found.
     """
-    current_path = start_path
-    while current_path != os.path.dirname(current_path):
+    current_path = os.path.abspath(start_path)
+    while True:
         if os.path.isdir(os.path.join(current_path, ".git")):
-            return os.path.abspath(current_path)
-        current_path = os.path.dirname(current_path)
-    return None
+            return current_path
+        parent_path = os.path.dirname(current_path)
+        if parent_path == current_path:
+            return None
+        current_path = parent_path
 
 
 def check_software_requirements(repo_path: str, log_message: Any) -> None:
@@ -128,14 +156,8 @@ def check_software_requirements(repo_path: str, log_message: Any) -> None:
     """
     log_message.info("Checking for software requirements", status="🔍")
 
-    try:
-        subprocess.run(
-            ["pre-commit", "--version"],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except subprocess.CalledProcessError:
+    # Look pre-commit up on PATH in-process rather than running it
+    if shutil.which("pre-commit") is None:
         log_message.info("pre-commit is not installed", status="Installing")
         try:
             subprocess.run(
@@ -224,6 +246,12 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Run without using LLM",
     )
+    parser.add_argument(
+        "--in-process-tests",
+        action="store_true",
+        help="Run unit tests inside push's interpreter; faster, but tests "
+        "the klingon_tools push has already imported",
+    )
     parser.add_argument(
         "--model",
         type=str,
@@ -273,10 +301,74 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+_GLOB_MAGIC = re.compile(r"[*?[]")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob_component(component: str) -> Pattern[str]:
+    """Return the compiled regex for a single glob path component."""
+    return re.compile(fnmatch.translate(component))
+
+
+def _scandir_glob(pattern: str, dirs_only: bool = False) -> List[str]:
+    """
+    Expand a glob pattern using one os.scandir call per directory.
+
+    Behaves like glob.glob: literal components are not listed, names starting
+    with a dot only match components that start with a dot, and "**" matches
+    a single path component. DirEntry type information is reused so the
+    directories in the middle of a pattern are not stat'ed again.
+
+    Args:
+        pattern: A file name or glob pattern.
+        dirs_only: Only return directories, used for parent components.
+
+    Returns:
+        List of matching paths.
+    """
+    if not _GLOB_MAGIC.search(pattern):
+        check = os.path.isdir if dirs_only else os.path.lexists
+        return [pattern] if check(pattern) else []
+
+    dirname, basename = os.path.split(pattern)
+    if _GLOB_MAGIC.search(dirname):
+        parents = _scandir_glob(dirname, dirs_only=True)
+    else:
+        parents = [dirname]
+
+    if not _GLOB_MAGIC.search(basename):
+        return [
+            path for parent in parents
+            for path in _scandir_glob(os.path.join(parent, basename),
+                                      dirs_only)
+        ]
+
+    match = _compile_glob_component(basename).match
+    include_hidden = basename.startswith(".")
+    matches = []
+    for parent in parents:
+        try:
+            with os.scandir(parent or os.curdir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") and not include_hidden:
+                        continue
+                    if not match(entry.name):
+                        continue
+                    if dirs_only and not entry.is_dir():
+                        continue
+                    matches.append(os.path.join(parent, entry.name))
+        except OSError:
+            continue
+    return matches
+
+
 def expand_file_patterns(patterns: List[str]) -> List[str]:
     """
     Expand file patterns into a list of matching file names.
 
+    Files matched by more than one pattern are listed once, in the order
+    they were first matched.
+
     Args:
         patterns: List of file names or glob patterns.
 
@@ -286,11 +378,10 @@ def expand_file_patterns(patterns: List[str]) -> List[str]:
     if not patterns:
         return []
 
-    expanded_files = []
-    for pattern in patterns:
-        expanded_files.extend(glob.glob(pattern))
-
-    return list(set(expanded_files))  # Remove duplicates
+    # Remove duplicates from overlapping patterns, keeping the first match
+    return list(dict.fromkeys(itertools.chain.from_iterable(
+        _scandir_glob(pattern) for pattern in patterns
+    )))
 
 
 def filter_git_files(
@@ -300,20 +391,58 @@ def filter_git_files(
 
     Args:
         all_files: List of all files to filter.
-        filter_files: List of files to keep.
+        filter_files: List of files to keep, compared as exact paths.
 
     Returns:
         Filtered list of files.
     """
-    return [f for f in all_files if f in filter_files]
+    keep = set(filter_files)
+    return [f for f in all_files if f in keep]
+
+
+def _run_tests_subprocess(no_llm: bool) -> int:
+    """Run ktest in a fresh interpreter, streaming its output.
+
+    Args:
+        no_llm: Whether to run tests without using LLM.
+
+    Returns:
+        The ktest exit code.
+    """
+    command = [sys.executable, "-m", "klingon_tools.ktest"]
+    if no_llm:
+        command.append("--no-llm")
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        bufsize=1
+    )
+
+    for line in process.stdout:
+        print(line, end='')
+
+    return process.wait()
+
 
+def run_tests(
+    log_message: Any = None,
+    no_llm: bool = False,
+    in_process: bool = False,
+) -> bool:
+    """Run tests using ktest and log the results.
 
-def run_tests(log_message: Any = None, no_llm: bool = False) -> bool:
-    """Run tests using ktest CLI command and log the results.
+    By default ktest runs in a fresh interpreter so the tests import the
+    working tree being committed. in_process runs ktest inside push's own
+    interpreter, which skips the interpreter start-up but tests whatever
+    copy of a module push has already imported, klingon_tools included.
 
     Args:
         log_message: The logging function to use for output.
         no_llm: Whether to run tests without using LLM.
+        in_process: Run ktest in this interpreter instead of a subprocess.
 
     Returns:
         True if tests pass, False otherwise.
@@ -325,22 +454,25 @@ def run_tests(log_message: Any = None, no_llm: bool = False) -> bool:
         )
 
     try:
-        command = [sys.executable, "-m", "klingon_tools.ktest"]
-        if no_llm:
-            command.append("--no-llm")
-
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
-        )
+        if in_process:
+            # Imported here so pushes with --no-tests never load pytest
+            from klingon_tools.ktest import ktest
 
-        for line in process.stdout:
-            print(line, end='')
-
-        return_code = process.wait()
+            # ktest resets the shared log level, so hand it the current one
+            loglevel = logging.getLevelName(
+                LogTools.logger.getEffectiveLevel()
+            )
+            # ktest restores sys.__stdout__/__stderr__ rather than the
+            # streams it replaced, so put back the caller's streams
+            stdout, stderr = sys.stdout, sys.stderr
+            try:
+                return_code = ktest(
+                    loglevel=loglevel, as_entrypoint=True, no_llm=no_llm
+                )
+            finally:
+                sys.stdout, sys.stderr = stdout, stderr
+        else:
+            return_code = _run_tests_subprocess(no_llm)
         tests_passed = return_code == 0
 
         if tests_passed:
@@ -668,18 +800,21 @@ def check_for_tests(args):
         return True
 
 
-def run_tests_and_confirm(log_message: Any, no_llm: bool) -> bool:
+def run_tests_and_confirm(
+    log_message: Any, no_llm: bool, in_process: bool = False
+) -> bool:
     """Run tests and confirm continuation if tests fail.
 
     Args:
         log_message: The logging function to use for output.
         no_llm: Whether to run tests without using LLM.
+        in_process: Run the tests inside push's interpreter.
 
     Returns:
         True if tests pass or user confirms to continue, False otherwise.
     """
     log_message.debug("Running tests before processing files", status="🔍")
-    tests_passed = run_tests(log_message, no_llm)
+    tests_passed = run_tests(log_message, no_llm, in_process)
     if not tests_passed:
         log_message.error(
             "Tests failed. Do you want to continue anyway? (y/n)", status="👾")
@@ -694,7 +829,8 @@ def run_tests_and_confirm(log_message: Any, no_llm: bool) -> bool:
 def process_changes(
         repo: Repo,
         args: argparse.Namespace,
-        litellm_tools: LiteLLMTools
+        litellm_tools: LiteLLMTools,
+        changes: GitChanges,
 ) -> bool:
     """
     Process changes made to the repository.
@@ -702,22 +838,25 @@ def process_changes(
         repo (Repo): The repository object.
         args (argparse.Namespace): The command line arguments.
         litellm_tools (LiteLLMTools): The LiteLLMTools object.
+        changes (GitChanges): The file lists to process.
     Returns:
         bool: True if changes were made, False otherwise.
     """
     changes_made = False
 
     # Handle deleted files first
-    if deleted_files:
+    if changes.deleted:
         log_message.info("Processing deleted files first", status="🗑️")
-        git_commit_deletes(repo, deleted_files)
+        git_commit_deletes(repo, list(changes.deleted))
         changes_made = True
 
         # Re-get status after handling deletes
-        global untracked_files, modified_files
-        (_, untracked_files, modified_files, _, _) = git_get_status(repo)
+        (_, untracked, modified, _, _) = git_get_status(repo)
+        changes = replace(
+            changes, untracked=tuple(untracked), modified=tuple(modified)
+        )
 
-    files_to_process = untracked_files + modified_files
+    files_to_process = [*changes.untracked, *changes.modified]
 
     if ".pre-commit-config.yaml" in files_to_process:
         log_message.info(
@@ -748,7 +887,7 @@ def process_changes(
                 files_to_process, repo, args, log_message, litellm_tools)
 
     # Always push if there are committed but not pushed files
-    if committed_not_pushed:
+    if changes.committed_not_pushed:
         log_message.info("Pushing committed but not pushed files", status="🚀")
         push_changes_if_needed(repo, args)
         changes_made = True
@@ -756,6 +895,23 @@ def process_changes(
     return changes_made
 
 
+async def _read_repo_info() -> Tuple[str, str, Optional[Repo]]:
+    """Read the git user information and open the top level repository.
+
+    Both lookups only read git state, so they run concurrently in worker
+    threads.
+
+    Returns:
+        The git user name, user email and top level repository, which is None
+        if it could not be opened.
+    """
+    ((user_name, user_email), repo) = await asyncio.gather(
+        asyncio.to_thread(get_git_user_info),
+        asyncio.to_thread(git_get_toplevel),
+    )
+    return user_name, user_email, repo
+
+
 def startup_tasks(args: argparse.Namespace) -> Tuple[Repo, str, str]:
     """Run startup maintenance tasks.
 
@@ -805,13 +961,11 @@ def startup_tasks(args: argparse.Namespace) -> Tuple[Repo, str, str]:
     # Check for software requirements
     check_software_requirements(repo_path, log_message)
 
-    # Get git user information
-    user_name, user_email = get_git_user_info()
+    # Get git user information and the top level git repository
+    user_name, user_email, repo = asyncio.run(_read_repo_info())
     log_message.info(f"Using git user name: {user_name}", status="✅")
     log_message.info(f"Using git user email: {user_email}", status="✅")
 
-    # Initialize top level git repository
-    repo = git_get_toplevel()
     if repo is None:
         log_message.error(
             "Failed to initialize git repository. Exiting",
@@ -955,13 +1109,21 @@ def main() -> int:
         if check_for_tests(args):
             # If check_for_tests returns True then run run_tests_and_confirm
             # otherwise just skip it.
-            if not run_tests_and_confirm(log_message, args.no_llm):
+            if not run_tests_and_confirm(
+                log_message, args.no_llm, args.in_process_tests
+            ):
                 return 1
         else:
             # Skip running tests as check_for_tests returned False
             pass
 
-    changes_made = process_changes(repo, args, litellm_tools)
+    changes = GitChanges(
+        deleted=tuple(deleted_files),
+        untracked=tuple(untracked_files),
+        modified=tuple(modified_files),
+        committed_not_pushed=tuple(committed_not_pushed),
+    )
+    changes_made = process_changes(repo, args, litellm_tools, changes)
 
     if changes_made:
         push_changes_if_needed(repo, args)
@@ -1,41 +1,406 @@
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+from typing import Dict
+from unittest.mock import MagicMock, Mock
+
 import pytest
-import warnings
 
 
-@pytest.fixture(autouse=True)
-def ignore_warnings():
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="pydantic"
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="Support for class-based `config` is deprecated*",
-        category=DeprecationWarning,
-    )
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="imghdr"
-    )
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="importlib_resources"
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="'imghdr' is deprecated and slated for removal in Python 3.13",
-        category=DeprecationWarning,
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="open_text is deprecated. Use files() instead.",
-        category=DeprecationWarning,
-    )
+def _stub_litellm():
+    """Install a lightweight stand-in for the ``litellm`` package.
+
+    litellm loads model registries, tokenizers and provider SDKs at import
+    time, which dominates collection even though the unit tests patch
+    ``litellm.completion`` anyway. Exception classes are generated on demand
+    so ``from litellm.exceptions import ...`` and ``except`` clauses keep
+    working. Only installed by pytest_configure, see there for when.
+    """
+    exceptions = types.ModuleType("litellm.exceptions")
+
+    def _exception(name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        exc = type(name, (Exception,), {"__module__": exceptions.__name__})
+        setattr(exceptions, name, exc)
+        return exc
+
+    exceptions.__getattr__ = _exception
+    stub = MagicMock(name="litellm")
+    stub.exceptions = exceptions
+    sys.modules.setdefault("litellm", stub)
+    sys.modules.setdefault("litellm.exceptions", exceptions)
 
 
 def pytest_addoption(parser):
     parser.addoption(
-        "--no-llm", action="store_true", default=False, help="Skip LLM tests"
+        "--no-llm",
+        action="store_true",
+        default=False,
+        help="Answer LLM calls from tests/fixtures/llm_cache.json",
     )
+    parser.addoption(
+        "--refresh-llm-cache",
+        action="store_true",
+        default=False,
+        help="Record real LLM answers into tests/fixtures/llm_cache.json",
+    )
+
+
+def pytest_configure(config):
+    """Stub litellm when no test in this run may reach a real model.
+
+    The stub is installed under --no-llm (unless ``KLINGON_REAL_LITELLM`` is
+    set) and when litellm is not installed at all. Runs without --no-llm
+    import the real package so the LLM tests exercise a real model.
+    """
+    if "litellm" not in sys.modules and (
+        importlib.util.find_spec("litellm") is None
+        or (
+            config.getoption("--no-llm")
+            and not os.environ.get("KLINGON_REAL_LITELLM")
+        )
+    ):
+        _stub_litellm()
+
+    # Recording from the stub would fill the cache with MagicMock answers
+    if config.getoption("--refresh-llm-cache") and isinstance(
+        sys.modules.get("litellm"), MagicMock
+    ):
+        raise pytest.UsageError(
+            "--refresh-llm-cache needs the real litellm package; install "
+            "it and run without --no-llm"
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip marked tests before any fixture runs.
+
+    Tests marked ``ollama_server_running`` talk to a live model that the
+    recorded cache cannot stand in for, so they are skipped under --no-llm.
+    """
+    if not config.getoption("--no-llm"):
+        return
+    skip_llm = pytest.mark.skip(
+        reason="Skipping live model tests due to --no-llm flag"
+    )
+    for item in items:
+        if "ollama_server_running" in item.keywords:
+            item.add_marker(skip_llm)
 
 
 @pytest.fixture
 def no_llm(pytestconfig):
     return pytestconfig.getoption("--no-llm")
+
+
+@pytest.fixture(scope="session")
+def openai_tools(request):
+    """Create one OpenAITools instance shared by the whole session.
+
+    Tests that replace attributes on it must use ``monkeypatch`` so the
+    change is undone before the next test runs. Under --no-llm every
+    completion is answered from the recorded cache, so a placeholder API key
+    stands in when none is set.
+    """
+    from klingon_tools.openai_tools import OpenAITools
+
+    with pytest.MonkeyPatch.context() as mp:
+        if request.config.getoption("--no-llm"):
+            mp.setenv(
+                "OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY") or "no-llm"
+            )
+        return OpenAITools(debug=True)
+
+
+@pytest.fixture
+def mock_repo():
+    """Provide a GitPython Repo stand-in that does no git I/O.
+
+    Function scoped because tests configure return values on it.
+    """
+    from git import Repo
+
+    return Mock(spec=Repo)
+
+
+LLM_CACHE_PATH = os.path.join(
+    os.path.dirname(__file__), "fixtures", "llm_cache.json"
+)
+# Commit log fed to the pr-* commands in place of origin/release..HEAD, so
+# their prompts, and therefore their cache keys, do not change per commit
+PR_COMMIT_LOG = "\n".join([
+    "feat(push): expand file patterns with os.scandir",
+    "fix(log_tools): pad status messages to the terminal width",
+    "docs(push): document the --in-process-tests flag",
+    "test(push): cover the pre-commit retry loop",
+])
+
+
+def _llm_cache_key(template_key: str, diff: str) -> str:
+    """Key a completion by its prompt template and a hash of its input."""
+    digest = hashlib.sha1(diff.encode("utf-8")).hexdigest()
+    return f"{template_key}:{digest}"
+
+
+@pytest.fixture(scope="session")
+def llm_cache(request):
+    """Load recorded LLM answers and save them again after a refresh."""
+    try:
+        with open(LLM_CACHE_PATH, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (FileNotFoundError, ValueError):
+        # A missing or corrupt cache is treated as empty
+        cache = {}
+
+    yield cache
+
+    if request.config.getoption("--refresh-llm-cache"):
+        # Serialise first and swap the file in, so a failure never leaves
+        # a truncated cache behind
+        text = json.dumps(cache, indent=2, sort_keys=True) + "\n"
+        cache_dir = os.path.dirname(LLM_CACHE_PATH)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                cache_file.write(text)
+            os.replace(tmp_path, LLM_CACHE_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+@pytest.fixture
+def mock_llm(request, monkeypatch, llm_cache):
+    """Answer LLM completions from the recorded cache under --no-llm.
+
+    Answers are keyed on the prompt template and its input, and the pr-*
+    commands read PR_COMMIT_LOG instead of the live commit log, so a
+    recorded answer keeps matching as the repository changes. A request with
+    no recorded answer fails the test. With --refresh-llm-cache (and without
+    --no-llm) the real completion call is made and its answer recorded.
+    Otherwise the real completion call is used unchanged.
+    """
+    no_llm = request.config.getoption("--no-llm")
+    refresh = request.config.getoption("--refresh-llm-cache")
+    if not no_llm and not refresh:
+        return None
+
+    import litellm
+    from openai.resources.chat.completions import Completions
+
+    from klingon_tools import entrypoints, litellm_tools, openai_tools
+
+    commit_log = subprocess.CompletedProcess([], 0, PR_COMMIT_LOG, "")
+    for module in (entrypoints, litellm_tools, openai_tools):
+        monkeypatch.setattr(
+            module, "get_commit_log", lambda branch_name: commit_log
+        )
+
+    # Set by generate_content for the completion call it makes
+    current = {}
+
+    def keyed(generate_content):
+        @functools.wraps(generate_content)
+        def wrapper(self, template_key, diff):
+            current["key"] = _llm_cache_key(template_key, diff)
+            try:
+                return generate_content(self, template_key, diff)
+            finally:
+                current.clear()
+
+        return wrapper
+
+    def replay(real_completion):
+        def completion(*args, **kwargs):
+            key = current.get("key")
+            if not no_llm:
+                response = real_completion(*args, **kwargs)
+                if key is not None:
+                    llm_cache[key] = response.choices[0].message.content
+                return response
+
+            if key not in llm_cache:
+                pytest.fail(
+                    f"No recorded LLM answer for {key}; record one with "
+                    "--refresh-llm-cache"
+                )
+            message = types.SimpleNamespace(content=llm_cache[key])
+            return types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=message)]
+            )
+
+        return completion
+
+    for tools in (litellm_tools.LiteLLMTools, openai_tools.OpenAITools):
+        monkeypatch.setattr(
+            tools, "generate_content", keyed(tools.generate_content)
+        )
+    monkeypatch.setattr(litellm, "completion", replay(litellm.completion))
+    monkeypatch.setattr(Completions, "create", replay(Completions.create))
+    return llm_cache
+
+
+@pytest.fixture(autouse=True)
+def _llm_marked(request):
+    """Route every ``llm``-marked test through mock_llm."""
+    if request.node.get_closest_marker("llm") is not None:
+        request.getfixturevalue("mock_llm")
+
+
+@pytest.fixture
+def run_entrypoint(capsys):
+    """Run a console-script entry point in-process.
+
+    Returns a callable taking the script name and its entry point function.
+    The function's return code and captured output are wrapped in a
+    ``subprocess.CompletedProcess`` so assertions written against
+    ``subprocess.run`` keep working without forking an interpreter.
+    """
+    def run(name, entrypoint):
+        returncode = entrypoint()
+        captured = capsys.readouterr()
+        return subprocess.CompletedProcess(
+            [name], returncode, captured.out, captured.err
+        )
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Provide a keep-alive HTTP session shared across the test session."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount(
+        "http://", HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    )
+    yield session
+    session.close()
+
+
+OLLAMA_PATH = shutil.which("ollama")
+OLLAMA_URL = "http://localhost:11434"
+
+# Without the Ollama CLI every test in test_ollama.py would be skipped, so
+# do not import or collect the module at all
+collect_ignore = []
+if OLLAMA_PATH is None:
+    collect_ignore.append("test_ollama.py")
+# Matches both "ollama version is X" and, when the server is down,
+# "client version is X"
+_OLLAMA_VERSION_RE = re.compile(r"version(?: is)?\s+(\d+\.\d+\.\d+)")
+
+
+@functools.lru_cache(maxsize=1)
+def ollama_cli_version() -> Dict[str, bool | str | None]:
+    """Capture and interpret the output of the `ollama --version` command.
+
+    Returns:
+        A dictionary with Ollama CLI installation information.
+
+    The dictionary contains the following key-value pairs:
+        - ollama_cli_installed (bool): Whether the Ollama CLI is installed.
+        - ollama_cli_version (str | None): Ollama CLI version if installed.
+    """
+    result = {
+        "ollama_cli_installed": False,
+        "ollama_cli_version": None,
+    }
+
+    try:
+        process = subprocess.run(
+            ["ollama", "--version"],
+            capture_output=True,
+            check=True,
+            timeout=2
+        )
+        result["ollama_cli_installed"] = True
+        output = (process.stdout + process.stderr).decode("ascii", "ignore")
+
+        version_match = _OLLAMA_VERSION_RE.search(output)
+        if version_match:
+            result["ollama_cli_version"] = version_match.group(1)
+
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        FileNotFoundError,
+    ):
+        pass
+
+    return result
+
+
+def ollama_server_running(http) -> bool:
+    """Return whether the Ollama server answers on OLLAMA_URL."""
+    import requests
+
+    try:
+        return http.get(OLLAMA_URL, timeout=2).ok
+    except requests.RequestException:
+        return False
+
+
+@pytest.fixture(scope="session")
+def ollama_url():
+    """Provide the base URL of the local Ollama server."""
+    return OLLAMA_URL
+
+
+@pytest.fixture(scope="session")
+def ollama_info(request, http):
+    """Provide Ollama CLI and server information for all tests.
+
+    The CLI version is stored in pytest's cache keyed on the CLI path and
+    mtime, so `ollama --version` only runs again after Ollama is upgraded or
+    moved. The server can start or stop between runs, so it is probed once
+    every session.
+    """
+    info = {"ollama_server_running": ollama_server_running(http)}
+    cache = getattr(request.config, "cache", None)
+    if cache is None or OLLAMA_PATH is None:
+        info.update(ollama_cli_version())
+        return info
+
+    key = {"path": OLLAMA_PATH, "mtime": os.path.getmtime(OLLAMA_PATH)}
+    cached = cache.get("ollama/version", None)
+    if cached and cached.get("key") == key:
+        info.update(
+            ollama_cli_installed=True, ollama_cli_version=cached["version"]
+        )
+        return info
+
+    info.update(ollama_cli_version())
+    if info["ollama_cli_version"] is not None:
+        cache.set(
+            "ollama/version",
+            {"key": key, "version": info["ollama_cli_version"]},
+        )
+    return info
+
+
+@pytest.fixture(scope="session")
+def ollama_models(http, ollama_url):
+    """Fetch the models available on the Ollama server once per session."""
+    import requests
+
+    try:
+        response = http.get(f"{ollama_url}/api/tags", timeout=5)
+        response.raise_for_status()
+        return response.json().get("models", [])
+    except requests.RequestException as e:
+        pytest.skip(f"Cannot retrieve models from Ollama server: {e}")
+    except json.JSONDecodeError as e:
+        pytest.skip(f"Invalid JSON response: {e}")
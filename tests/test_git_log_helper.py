@@ -1,4 +1,5 @@
-from unittest.mock import patch, MagicMock
+import types
+from unittest.mock import patch
 from klingon_tools.git_log_helper import branch_exists, get_commit_log
 
 
@@ -18,7 +19,7 @@ def test_branch_exists_false(mock_run):
 @patch('subprocess.run')
 def test_get_commit_log_existing_branch(mock_run, mock_branch_exists):
     mock_branch_exists.return_value = True
-    mock_run.return_value = MagicMock(stdout="Commit 1\nCommit 2")
+    mock_run.return_value = types.SimpleNamespace(stdout="Commit 1\nCommit 2")
     result = get_commit_log("existing_branch")
     assert result.stdout == "Commit 1\nCommit 2"
 
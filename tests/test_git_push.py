@@ -1,8 +1,7 @@
 """Unit tests for the git_push module."""
 
-import pytest
 from unittest.mock import Mock, patch, call
-from git import Repo, GitCommandError
+from git import GitCommandError
 from klingon_tools.git_push import (
     git_push,
     push_changes,
@@ -17,12 +16,6 @@ from klingon_tools.git_tools import (
 )
 
 
-@pytest.fixture
-def mock_repo():
-    """Creates a mock Git repository."""
-    return Mock(spec=Repo)
-
-
 @patch('klingon_tools.git_push._handle_file_deletions')
 @patch('klingon_tools.git_push._generate_and_commit_messages')
 @patch('klingon_tools.git_push._is_submodule')
@@ -43,8 +43,25 @@ def test_git_get_toplevel():
 
 
 def test_git_get_status(mock_repo):
-    mock_repo.index.diff.return_value = []
-    mock_repo.untracked_files = []
+    mock_repo.git.status.return_value = ""
+    mock_repo.head.commit.diff.return_value = []
     result = git_get_status(mock_repo)
     assert len(result) == 5
     assert all(isinstance(item, list) for item in result)
+
+
+def test_git_get_status_parses_porcelain(mock_repo):
+    mock_repo.git.status.return_value = "\0".join([
+        "1 .M N... 100644 100644 100644 abc abc src/a file.py",
+        "1 .D N... 100644 100644 000000 abc abc gone.py",
+        "1 A. N... 000000 100644 100644 000 abc new.py",
+        "2 R. N... 100644 100644 100644 abc abc R100 moved.py",
+        "old.py",
+        "? notes.txt",
+    ])
+    mock_repo.head.commit.diff.return_value = []
+    deleted, untracked, modified, staged, _ = git_get_status(mock_repo)
+    assert deleted == ["gone.py"]
+    assert untracked == ["notes.txt"]
+    assert modified == ["src/a file.py"]
+    assert staged == ["new.py", "moved.py"]
@@ -1,18 +1,10 @@
 """Unit tests for the git_unstage module."""
 
-import pytest
-from git import Repo
 from git.exc import GitCommandError
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from klingon_tools.git_unstage import git_unstage_files
 
 
-@pytest.fixture
-def mock_repo():
-    """Create a mock Repo object."""
-    return Mock(spec=Repo)
-
-
 @patch('klingon_tools.git_unstage.log_message')
 def test_git_unstage_files_no_staged_files(mock_log, mock_repo):
     """Test unstaging when there are no staged files."""
@@ -7,6 +7,14 @@ from git import GitCommandError
 from klingon_tools.git_user_info import get_git_user_info
 
 
+@pytest.fixture(autouse=True)
+def clear_user_info_cache():
+    """Make every test look up the git user info afresh."""
+    get_git_user_info.cache_clear()
+    yield
+    get_git_user_info.cache_clear()
+
+
 @pytest.fixture
 def mock_subprocess_run():
     """Fixture to mock subprocess.run."""
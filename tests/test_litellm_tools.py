@@ -2,6 +2,12 @@ import pytest
 from unittest.mock import patch, MagicMock
 from klingon_tools.litellm_tools import LiteLLMTools
 
+_A72 = "A" * 72
+_A71 = "A" * 71
+_LONG = "This is a long pull request title that exceeds 72 characters limit"
+_SHORT = "Short title"
+_SHORT_PADDED = _SHORT.ljust(72, " ")
+
 
 @pytest.fixture
 def litellm_tools():
@@ -20,10 +26,9 @@ def test_get_working_model(litellm_tools):
     assert model == "gpt-4o-mini"
 
 
+@pytest.mark.llm
 @patch('litellm.completion')
-def test_generate_content(mock_completion, litellm_tools, no_llm):
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
+def test_generate_content(mock_completion, litellm_tools):
     mock_completion.return_value = MagicMock(
         choices=[
             MagicMock(
@@ -44,41 +49,28 @@ def test_format_message(litellm_tools):
     assert formatted.startswith("✨ feat(scope): Add new feature")
 
 
-def test_format_pr_title(litellm_tools):
-    # Test long title
-    long_title = (
-        "This is a long pull request title that exceeds 72 characters limit"
-    )
-    formatted_long = litellm_tools.format_pr_title(long_title)
-
-    # Check if it's truncated and ends with "..."
-    assert len(formatted_long) == 72
-
-    # Test title exactly 72 characters
-    exact_title = "A" * 72
-    formatted_exact = litellm_tools.format_pr_title(exact_title)
-
-    # Check if it's exactly 72 characters and unchanged
-    assert len(formatted_exact) == 72
-    assert formatted_exact == exact_title
-
-    # Test short title
-    short_title = "Short title"
-    formatted_short = litellm_tools.format_pr_title(short_title)
-
-    # Check if it's padded with spaces to 72 characters
-    assert len(formatted_short) == 72
-    assert formatted_short.startswith(short_title)
-    assert formatted_short.endswith(" ")
-    assert formatted_short == short_title.ljust(72, " ")
-
-    # Test title with 71 characters
-    title_71 = "A" * 71
-    formatted_71 = litellm_tools.format_pr_title(title_71)
-
-    # Check if it's padded with one space to 72 characters
-    assert len(formatted_71) == 72
-    assert formatted_71 == title_71 + " "
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        # Long title under the limit is padded to 72 characters
+        (_LONG, _LONG.ljust(72, " ")),
+        # Title exactly 72 characters is unchanged
+        (_A72, _A72),
+        # Short title is padded with spaces to 72 characters
+        (_SHORT, _SHORT_PADDED),
+        # Title with 71 characters is padded with one space
+        (_A71, _A71 + " "),
+        # Title over 72 characters is truncated and ends with "..."
+        ("A" * 80, "A" * 69 + "..."),
+        # Runs of whitespace are collapsed before padding
+        ("Short \t title\n", _SHORT_PADDED),
+    ],
+    ids=["long", "exact", "short", "71-chars", "truncated", "whitespace"],
+)
+def test_format_pr_title(litellm_tools, title, expected):
+    formatted = litellm_tools.format_pr_title(title)
+    assert len(formatted) == 72
+    assert formatted == expected
 
 
 @patch('klingon_tools.litellm_tools.get_git_user_info')
@@ -4,6 +4,11 @@ import pytest
 import logging
 from klingon_tools.log_tools import LogTools
 
+_LEVELS = {
+    level: getattr(logging, level)
+    for level in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
 log_tools = LogTools(debug=False)
 
 log_message = log_tools.log_message
@@ -31,15 +36,14 @@ def test_default_style():
     assert log_tools.default_style == "default"
 
 
-@pytest.mark.parametrize(
-    "level", ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-)
+@pytest.mark.parametrize("level", list(_LEVELS))
 def test_set_log_level_functionality(level):
     """Test if set_log_level function changes the log level correctly."""
+    expected = _LEVELS[level]
     log_tools.set_log_level(level)
     # Assuming log_tools has a method or attribute to get the current log level
-    assert log_tools.get_log_level() == getattr(logging, level)
-    assert log_message.get_log_level() == getattr(logging, level)
+    assert log_tools.get_log_level() == expected
+    assert log_message.get_log_level() == expected
 
 
 def test_set_default_style_functionality():
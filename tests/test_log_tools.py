@@ -1,33 +1,45 @@
 """Tests for the LogTools class and its methods."""
 
-from io import StringIO
-from typing import Tuple
+import collections
+import subprocess
+import types
+from typing import Iterator, Tuple
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from klingon_tools.log_tools import LogTools, logging
 
 log_tools = LogTools(debug=True)
 
+# 80 characters minus status length and a space
+_MAX_MSG_LEN = 80 - len(" Passed") - 1
+
 
 class LogCaptureHandler(logging.Handler):
     """A custom logging handler to capture log messages for testing."""
 
     def __init__(self):
         super().__init__()
-        self.messages = []
+        # Bounded so tests that log heavily cannot grow the capture unchecked
+        self.messages = collections.deque(maxlen=1024)
+        self._formatter = logging.Formatter('%(levelname)s %(message)s')
+        self.setFormatter(self._formatter)
+
+    @property
+    def text(self):
+        """Return all captured messages joined by newlines."""
+        return "\n".join(self.messages)
 
     def emit(self, record):
         """Capture a log record by appending it to the messages list."""
-        formatter = logging.Formatter('%(levelname)s %(message)s')
-        self.setFormatter(formatter)
-
         # Check if there is exception information to include in the log message
         if record.exc_info:
             # Format the exception message and traceback
             formatted_message = self.format(record)
-            exception_message = formatter.formatException(record.exc_info)
+            exception_message = self._formatter.formatException(
+                record.exc_info
+            )
             # Append both the formatted message and the exception traceback
             self.messages.append(f"{formatted_message}\n{exception_message}")
         else:
@@ -36,22 +48,43 @@ class LogCaptureHandler(logging.Handler):
 
 
 @pytest.fixture
-def log_tools_fixture() -> Tuple[LogTools, LogCaptureHandler]:
-    """Create a LogTools instance with a LogCaptureHandler."""
-    lt = LogTools(debug=True)
+def log_tools_fixture(request) -> Iterator[Tuple[LogTools, LogCaptureHandler]]:
+    """Create a LogTools instance with a LogCaptureHandler.
+
+    The debug flag defaults to True and can be overridden per test with
+    ``@pytest.mark.parametrize("log_tools_fixture", [...], indirect=True)``.
+    """
+    lt = LogTools(debug=getattr(request, "param", True))
     log_capture_handler = LogCaptureHandler()
     lt.logger.addHandler(log_capture_handler)
     lt.log_message.logger.addHandler(log_capture_handler)
-    return lt, log_capture_handler
+    yield lt, log_capture_handler
+    lt.logger.removeHandler(log_capture_handler)
+    lt.log_message.logger.removeHandler(log_capture_handler)
 
 
-def test_init():
+@pytest.fixture
+def mock_subprocess_run():
+    """Patch subprocess.run with a successful, empty result by default."""
+    with patch("subprocess.run") as run:
+        run.return_value = types.SimpleNamespace(
+            returncode=0, stdout="", stderr=""
+        )
+        yield run
+
+
+@pytest.mark.parametrize(
+    "log_tools_fixture, expected_level",
+    [(True, logging.DEBUG), (False, logging.INFO)],
+    indirect=["log_tools_fixture"],
+)
+def test_init(log_tools_fixture, expected_level):
     """Test the initialization of the LogTools class."""
-    lt = LogTools(debug=True)
-    assert lt.debug is True
+    lt, _ = log_tools_fixture
+    assert lt.debug is (expected_level == logging.DEBUG)
     assert lt.default_style == "default"
     assert isinstance(lt.log_message, LogTools.LogMessage)
-    assert lt.logger.level == logging.DEBUG
+    assert lt.logger.level == expected_level
 
 
 def test_set_default_style(log_tools_fixture):
@@ -84,8 +117,7 @@ def test_log_message(log_tools_fixture):
     assert any("OK" in msg for msg in log_capture.messages)
 
 
-@patch("sys.stdout", new_callable=StringIO)
-def test_method_state_decorator(mock_stdout, log_tools_fixture):
+def test_method_state_decorator(capsys, log_tools_fixture):
     """Test the method_state decorator of LogTools."""
     lt, log_capture = log_tools_fixture
 
@@ -99,7 +131,7 @@ def test_method_state_decorator(mock_stdout, log_tools_fixture):
         return True
 
     result = test_method()
-    stdout_output = mock_stdout.getvalue()
+    stdout_output = capsys.readouterr().out
     log_messages = log_capture.messages
 
     assert "Running Test method" in stdout_output
@@ -107,35 +139,10 @@ def test_method_state_decorator(mock_stdout, log_tools_fixture):
     assert result is True
 
 
-@patch("sys.stdout", new_callable=StringIO)
-@patch("subprocess.run")
-def test_command_state(mock_subprocess_run, mock_stdout, log_tools_fixture):
-    """Test the command_state method of LogTools."""
-    lt, log_capture = log_tools_fixture
-    mock_subprocess_run.return_value = MagicMock(
-        returncode=0, stdout="Command output", stderr=""
-    )
-    commands = [("echo 'test'", "Test Command")]
-
-    lt.command_state(commands, style="default", status="Passed")
-
-    stdout_output = mock_stdout.getvalue()
-    log_messages = log_capture.messages
-
-    assert "Running Test Command" in stdout_output or any(
-        "Running Test Command" in msg for msg in log_messages
-    )
-    assert "Passed" in stdout_output or any(
-        "Passed" in msg for msg in log_messages
-    )
-
-
 def test_format_pre_commit():
     """Test the _format_pre_commit static method of LogTools."""
-    # 80 characters minus status length and a space
-    max_msg_length = 80 - len(" Passed") - 1
     formatted = LogTools.LogMessage._format_pre_commit(
-        "Test message", "Passed", max_msg_length
+        "Test message", "Passed", _MAX_MSG_LEN
     )
     assert "Test message" in formatted
     assert "Passed" in formatted
@@ -158,21 +165,21 @@ def test_log_message_styles(log_tools_fixture):
     assert any("Test none" in msg for msg in messages)
 
 
-def test_log_message_levels(log_tools_fixture):
+@pytest.mark.parametrize(
+    "method, text",
+    [
+        ("debug", "Debug message"),
+        ("info", "Info message"),
+        ("warning", "Warning message"),
+        ("error", "Error message"),
+        ("critical", "Critical message"),
+    ],
+)
+def test_log_message_levels(log_tools_fixture, method, text):
     """Test different logging levels of LogTools."""
     lt, log_capture = log_tools_fixture
-    lt.log_message.debug("Debug message")
-    lt.log_message.info("Info message")
-    lt.log_message.warning("Warning message")
-    lt.log_message.error("Error message")
-    lt.log_message.critical("Critical message")
-
-    messages = log_capture.messages
-    assert any("Debug message" in msg for msg in messages)
-    assert any("Info message" in msg for msg in messages)
-    assert any("Warning message" in msg for msg in messages)
-    assert any("Error message" in msg for msg in messages)
-    assert any("Critical message" in msg for msg in messages)
+    getattr(lt.log_message, method)(text)
+    assert text in log_capture.text
 
 
 def test_log_message_exception(log_tools_fixture):
@@ -186,9 +193,6 @@ def test_log_message_exception(log_tools_fixture):
 
     messages = log_capture.messages
 
-    # Print the captured messages to verify the content
-    print("Captured log messages:", messages)
-
     # Check for the custom log message
     assert any("Exception occurred" in msg for msg in messages), \
         "Custom exception message not found in logs"
@@ -196,3 +200,73 @@ def test_log_message_exception(log_tools_fixture):
     # Check for the actual exception message in the traceback
     assert any("Test exception" in msg for msg in messages), \
         "The exception message 'Test exception' was not found in the logs"
+
+
+def _run_command_state(lt):
+    """Run the test command through LogTools.command_state."""
+    lt.command_state(
+        [("exit 2", "Test Command")], style="default", status="Passed"
+    )
+
+
+def _run_method_state(lt):
+    """Run the test command inside a LogTools.method_state method."""
+    @lt.method_state(message="Test Command", style="default", status="Passed")
+    def run_command():
+        return subprocess.run(
+            "exit 2", check=True, capture_output=True, text=True
+        )
+
+    run_command()
+
+
+@pytest.mark.parametrize(
+    "runner, side_effect, expected_output, expect_raises",
+    [
+        (_run_command_state, None, "Passed", False),
+        (
+            _run_command_state,
+            subprocess.CalledProcessError(2, "exit 2"),
+            "ERROR",
+            True,
+        ),
+        (_run_method_state, None, "Passed", False),
+        # method_state logs the failure instead of re-raising it
+        (
+            _run_method_state,
+            subprocess.CalledProcessError(2, "exit 2"),
+            "Passed",
+            False,
+        ),
+    ],
+    ids=[
+        "command_state",
+        "command_state-error",
+        "method_state",
+        "method_state-error",
+    ],
+)
+def test_command_state(mock_subprocess_run, capsys, log_tools_fixture,
+                       runner, side_effect, expected_output, expect_raises):
+    """Test running a command through command_state and method_state."""
+    lt, log_capture = log_tools_fixture
+    mock_subprocess_run.side_effect = side_effect
+
+    if expect_raises:
+        with pytest.raises(
+            subprocess.CalledProcessError,
+            match=r"Command 'exit 2' returned non-zero exit status 2",
+        ):
+            runner(lt)
+    else:
+        runner(lt)
+
+    mock_subprocess_run.assert_called_once_with(
+        "exit 2", check=True, capture_output=True, text=True
+    )
+    stdout_output = capsys.readouterr().out
+    assert "Running Test Command" in stdout_output
+    assert (expected_output in stdout_output
+            or expected_output in log_capture.text)
+    if runner is _run_method_state and side_effect is not None:
+        assert "An unexpected error occurred" in log_capture.text
@@ -0,0 +1,44 @@
+"""Benchmarks for the LogTools logging hot paths.
+
+These track the per-iteration cost of logging a message once fixture setup
+has been paid, so regressions in the formatting path show up as a change in
+the benchmark table. The module is skipped when pytest-benchmark is not
+installed and deselected by default through the ``perf`` marker; run it
+with ``make test-benchmark`` or ``pytest tests/test_log_tools_benchmark.py
+-m perf --benchmark-only``.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from klingon_tools.log_tools import LogTools  # noqa: E402
+
+pytestmark = pytest.mark.perf
+
+
+@pytest.fixture(scope="module")
+def log_tools():
+    """Create a single LogTools instance shared by every benchmark."""
+    return LogTools(debug=True)
+
+
+def test_log_message_benchmark(benchmark, log_tools):
+    """Benchmark a single default-style info message."""
+    benchmark(
+        log_tools.log_message.info,
+        "Test message",
+        style="default",
+        status="OK",
+    )
+
+
+def test_format_pre_commit_benchmark(benchmark):
+    """Benchmark the pre-commit formatter in isolation."""
+    formatted = benchmark(
+        LogTools.LogMessage._format_pre_commit,
+        "Test message",
+        "Passed",
+        80 - len(" Passed") - 1,
+    )
+    assert len(formatted) <= 80
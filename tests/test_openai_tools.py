@@ -2,48 +2,28 @@
 """Tests for the OpenAITools class and its methods."""
 
 from unittest.mock import patch, MagicMock
-import logging
 import pytest
 
 from klingon_tools.openai_tools import OpenAITools
 
-
-@pytest.fixture
-def no_llm(request):
-    """Fixture to access the --no-llm flag."""
-    return request.config.getoption("--no-llm")
-
-
-@pytest.fixture(scope="module", autouse=True)
-def disable_logging():
-    """Disable logging for all tests in this module."""
-    logging.disable(logging.CRITICAL)
-    yield
-    logging.disable(logging.NOTSET)
-
-
-@pytest.fixture
-def openai_tools(no_llm):
-    """Create an instance of OpenAITools."""
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
-    return OpenAITools(debug=True)
+# Under --no-llm conftest answers every completion from the recorded cache
+pytestmark = pytest.mark.llm
 
 
 @patch("klingon_tools.openai_tools.get_commit_log")
 def test_generate_pull_request_summary(
     mock_get_commit_log,
     openai_tools,
-    no_llm
+    monkeypatch,
 ):
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
     """Test the generate_pull_request_summary method."""
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
     mock_get_commit_log.return_value.stdout = "commit log content"
-    openai_tools.generate_content = MagicMock(
-        return_value="Generated PR Summary"
+    # The instance is shared across the session, so patch the class: undoing
+    # an instance patch would leave a bound method shadowing later patches
+    monkeypatch.setattr(
+        OpenAITools,
+        "generate_content",
+        MagicMock(return_value="Generated PR Summary"),
     )
 
     summary = openai_tools.generate_pull_request_summary()
@@ -51,21 +31,17 @@ def test_generate_pull_request_summary(
     openai_tools.generate_content.assert_called_once_with(
         "pull_request_summary", "commit log content"
     )
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
     assert summary == "Generated PR Summary"
 
 
-def test_init_with_valid_api_key(openai_tools, no_llm):
+def test_init_with_valid_api_key(openai_tools):
     """Test initialization of OpenAITools with a valid API key."""
     assert openai_tools.debug is True
     assert openai_tools.client is not None
 
 
 @patch("openai.ChatCompletion.create")
-def test_generate_pull_request_title(mock_create, openai_tools, no_llm):
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
+def test_generate_pull_request_title(mock_create, openai_tools):
     """Test the generate_pull_request_title method."""
     mock_create.return_value = MagicMock(
         choices=[MagicMock(message=MagicMock(content="Generated PR title"))]
@@ -78,35 +54,38 @@ def test_generate_pull_request_title(mock_create, openai_tools, no_llm):
 
 
 @pytest.mark.parametrize(
-    "message, expected, should_raise",
+    "message, expected",
     [
-        (
+        pytest.param(
             "feat(klingon): add new feature",
             "✨ feat(klingon): add new feature",
-            False,
+            id="feat-klingon",
         ),
-        ("invalid message", None, True),
-        ("feat: minimal valid message", None, True),
-        (
+        pytest.param("invalid message", ValueError, id="invalid"),
+        pytest.param(
+            "feat: minimal valid message", ValueError, id="missing-scope"
+        ),
+        pytest.param(
             "feat(core): minimal valid message",
             "✨ feat(core): minimal valid message",
-            False,
+            id="feat-core",
         ),
-        (
+        pytest.param(
             "fix(bug): fix critical issue",
             "🐛 fix(bug): fix critical issue",
-            False,
+            id="fix-bug",
         ),
     ],
 )
-def test_format_message(openai_tools, message, expected, should_raise):
+def test_format_message(openai_tools, message, expected):
     """Test the format_message method with various inputs."""
-    if should_raise:
+    if expected is ValueError:
+        # Only format_message itself may raise, so a failing fixture still
+        # shows up as an error
         with pytest.raises(ValueError):
             openai_tools.format_message(message)
     else:
-        formatted_message = openai_tools.format_message(message)
-        assert formatted_message == expected
+        assert openai_tools.format_message(message) == expected
 
 
 @pytest.mark.parametrize(
@@ -150,11 +129,9 @@ def test_generate_commit_message(
     mock_generate,
     mock_stage_diff,
     openai_tools,
-    no_llm
+    mock_repo,
 ):
     """Test the generate_commit_message method."""
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
     mock_generate.return_value = "feat(test): add new feature"
     mock_format.return_value = "✨ feat(test): add new feature"
     mock_signoff.return_value = (
@@ -162,9 +139,7 @@ def test_generate_commit_message(
         "Signed-off-by: John <john@example.com>"
     )
 
-    result = openai_tools.generate_commit_message(
-        "test.py", MagicMock()
-    )
+    result = openai_tools.generate_commit_message("test.py", mock_repo)
 
     assert result == (
         "✨ feat(test): add new feature\n\n"
@@ -177,9 +152,7 @@ def test_generate_commit_message(
 
 
 @patch.object(OpenAITools, "generate_content")
-def test_generate_pull_request_body(mock_generate, openai_tools, no_llm):
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
+def test_generate_pull_request_body(mock_generate, openai_tools):
     """Test the generate_pull_request_body method."""
     mock_generate.return_value = "Test PR body"
     result = openai_tools.generate_pull_request_body("Test diff")
@@ -191,14 +164,11 @@ def test_generate_pull_request_body(mock_generate, openai_tools, no_llm):
 @patch.object(OpenAITools, "format_message")
 @patch("klingon_tools.openai_tools.git_unstage_files")
 def test_generate_release_body(
-    mock_unstage, mock_format, mock_generate, openai_tools, no_llm
+    mock_unstage, mock_format, mock_generate, openai_tools, mock_repo
 ):
     """Test the generate_release_body method."""
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
     mock_format.return_value = "Formatted test release body"
     mock_generate.return_value = "Test release body"
-    mock_repo = MagicMock()
     mock_repo.git.diff.return_value = "file1.py\nfile2.py"
 
     result = openai_tools.generate_release_body(mock_repo, "Test diff", True)
@@ -206,10 +176,7 @@ def test_generate_release_body(
     assert result == "Formatted test release body"
     mock_generate.assert_called_once_with("release_body", "Test diff")
     mock_unstage.assert_called_once_with(["file1.py", "file2.py"])
-    mock_unstage.assert_called_once_with(["file1.py", "file2.py"])
-    mock_unstage.assert_called_once_with(["file1.py", "file2.py"])
     mock_format.assert_called_once_with("Test release body")
-    mock_unstage.assert_called_once_with(["file1.py", "file2.py"])
 
 
 if __name__ == "__main__":
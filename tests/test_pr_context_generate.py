@@ -9,21 +9,20 @@ command-line tool. It verifies the command's execution and output.
 import subprocess
 import pytest
 
+from klingon_tools.entrypoints import gh_pr_gen_context
 
-@pytest.fixture
-def no_llm(pytestconfig):
-    """
-    Fixture to access the --no-llm flag.
-    """
-    return pytestconfig.getoption("--no-llm")
+pytestmark = pytest.mark.cli
 
 
 @pytest.mark.parametrize("debug", [False, True])
-def test_pr_context_generate(no_llm, debug: bool, capsys) -> None:
+def test_pr_context_generate(
+    debug: bool, capsys, mock_llm, run_entrypoint
+) -> None:
     """
     Test the pr-context-generate command execution and output.
 
-    This test runs the pr-context-generate command and checks its output.
+    This test runs the pr-context-generate entry point in-process and
+    checks its output.
 
     Assertions:
     1. Check that the command ran without errors (return code 0).
@@ -34,6 +33,7 @@ def test_pr_context_generate(no_llm, debug: bool, capsys) -> None:
     Args:
         debug (bool): Flag to enable debug output.
         capsys: Pytest fixture to capture system output.
+        mock_llm: Fixture that stubs the LLM call under --no-llm.
 
     Raises:
         AssertionError: If any of the assertions fail.
@@ -44,17 +44,8 @@ def test_pr_context_generate(no_llm, debug: bool, capsys) -> None:
         3. If in debug mode, checks for the presence of debug information in
            the output.
     """
-    # Skip the test if the --no-llm flag is set
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
-
-    # Run the pr-context-generate command
-    result = subprocess.run(
-        ["pr-context-generate"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    # Run the pr-context-generate entry point in-process
+    result = run_entrypoint("pr-context-generate", gh_pr_gen_context)
 
     # Debugging output
     if debug:
@@ -68,12 +59,11 @@ def test_pr_context_generate(no_llm, debug: bool, capsys) -> None:
     captured = capsys.readouterr()
 
     # Assertions
-    assert_pr_context_generate_output(no_llm, result,
+    assert_pr_context_generate_output(result,
                                       captured.out if debug else "", debug)
 
 
 def assert_pr_context_generate_output(
-    no_llm: bool,
     result: subprocess.CompletedProcess,
     debug_output: str,
     debug: bool
@@ -98,10 +88,6 @@ def assert_pr_context_generate_output(
            - Checks for the presence of "RETURN CODE:", "STDOUT:", and
            "STDERR:" in the debug output.
     """
-    # Skip the test if the --no-llm flag is set
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
-
     # Check that the command ran without errors
     assert result.returncode == 0, \
         f"Command failed with return code {result.returncode}"
@@ -1,81 +1,31 @@
 import subprocess
 import pytest
-import warnings
 
+from klingon_tools.entrypoints import gh_pr_gen_summary
 
-@pytest.fixture(autouse=True)
-def ignore_warnings():
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="pydantic"
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="Support for class-based `config` is deprecated*",
-        category=DeprecationWarning,
-    )
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="imghdr"
-    )
-    warnings.filterwarnings(
-        "ignore", category=DeprecationWarning, module="importlib_resources"
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="'imghdr' is deprecated and slated for removal in Python 3.13",
-        category=DeprecationWarning,
-    )
-    warnings.filterwarnings(
-        "ignore",
-        message="open_text is deprecated. Use files() instead.",
-        category=DeprecationWarning,
-    )
-
-
-def pytest_addoption(parser):
-    parser.addoption(
-        "--no-llm", action="store_true", default=False, help="Skip LLM tests"
-    )
-
-
-@pytest.fixture
-def no_llm(pytestconfig):
-    return pytestconfig.getoption("--no-llm")
-
-
-@pytest.fixture
-def no_llm(pytestconfig):
-    """
-    Fixture to access the --no-llm flag.
-    """
-    return pytestconfig.getoption("--no-llm")
+pytestmark = pytest.mark.cli
 
 
 @pytest.mark.parametrize("debug", [False, True])
-def test_pr_summary_generate(no_llm, debug: bool, capsys) -> None:
+def test_pr_summary_generate(
+    debug: bool, capsys, mock_llm, run_entrypoint
+) -> None:
     """
     Test the pr-summary-generate command execution and output.
 
-    This test runs the pr-summary-generate command and checks its output.
+    This test runs the pr-summary-generate entry point in-process and
+    checks its output.
 
     Args:
-        no_llm (bool): Flag to skip LLM tests.
         debug (bool): Flag to enable debug output.
         capsys: Pytest fixture to capture system output.
+        mock_llm: Fixture that stubs the LLM call under --no-llm.
 
     Raises:
         AssertionError: If any of the assertions fail.
     """
-    # Skip the test if the --no-llm flag is set
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
-
-    # Run the pr-summary-generate command
-    result = subprocess.run(
-        ["pr-summary-generate"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    # Run the pr-summary-generate entry point in-process
+    result = run_entrypoint("pr-summary-generate", gh_pr_gen_summary)
 
     # Debugging output
     if debug:
@@ -90,12 +40,11 @@ def test_pr_summary_generate(no_llm, debug: bool, capsys) -> None:
 
     # Assertions
     assert_pr_summary_generate_output(
-        no_llm, result, captured.out if debug else "", debug
+        result, captured.out if debug else "", debug
     )
 
 
 def assert_pr_summary_generate_output(
-        no_llm: bool,
         result: subprocess.CompletedProcess,
         debug_output: str,
         debug: bool) -> None:
@@ -103,7 +52,6 @@ def assert_pr_summary_generate_output(
     Assert the output of pr-summary-generate command.
 
     Args:
-        no_llm (bool): Flag to skip LLM tests.
         result (subprocess.CompletedProcess): The result of the command execution.
         debug_output (str): Captured debug output, if any.
         debug (bool): Flag indicating whether debug mode is active.
@@ -111,10 +59,6 @@ def assert_pr_summary_generate_output(
     Raises:
         AssertionError: If any of the assertions fail.
     """
-    # Skip the test if the --no-llm flag is set
-    if no_llm:
-        pytest.skip("Skipping LLM tests due to --no-llm flag")
-
     # Check that the command ran without errors
     assert result.returncode == 0, f"Command failed with return code {
         result.returncode}"
@@ -1,9 +1,16 @@
+import argparse
+import io
 import os
-from unittest.mock import MagicMock, patch
+import sys
+import types
+from unittest.mock import DEFAULT, Mock, mock_open, patch
 
 import pytest
+from klingon_tools.litellm_tools import LiteLLMTools
+from klingon_tools.log_tools import LogTools
 from klingon_tools.push import (
-    git_get_toplevel as find_git_root,
+    GitChanges,
+    find_git_root,
     check_software_requirements,
     ensure_pre_commit_config,
     parse_arguments,
@@ -20,22 +27,47 @@ from klingon_tools.push import (
 )
 
 
-def test_check_software_requirements():
-    mock_log = MagicMock()
-    with patch('subprocess.run') as mock_run:
+def _mock_log():
+    """Return a log_message stand-in limited to the LogMessage interface."""
+    return Mock(spec=LogTools.LogMessage)
+
+
+def _mock_args(**overrides):
+    """Return parsed push arguments with the flags the helpers read."""
+    values = {'dryrun': False, 'oneshot': False, 'debug': False}
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def _mock_litellm():
+    """Return a LiteLLMTools stand-in that does not touch any model."""
+    return Mock(spec=LiteLLMTools)
+
+
+@pytest.mark.parametrize(
+    "which, installs",
+    [
+        pytest.param('/usr/bin/pre-commit', False, id="installed"),
+        pytest.param(None, True, id="missing"),
+    ],
+)
+def test_check_software_requirements(which, installs):
+    mock_log = _mock_log()
+    with patch('shutil.which', return_value=which), \
+            patch('subprocess.run') as mock_run:
         check_software_requirements('/path/to/repo', mock_log)
-        mock_run.assert_called_once()
+        assert mock_run.called is installs
 
 
 def test_ensure_pre_commit_config():
-    mock_log = MagicMock()
+    mock_log = _mock_log()
     with patch('os.path.exists') as mock_exists, \
             patch('requests.get') as mock_get, \
-            patch('builtins.open', create=True) as mock_open:
+            patch('builtins.open', mock_open()) as mock_file:
         mock_exists.return_value = False
         mock_get.return_value.text = 'config content'
         ensure_pre_commit_config('/path/to/repo', mock_log)
-        mock_open.assert_called_once_with(
+        mock_file.assert_called_once_with(
             '/path/to/repo/.pre-commit-config.yaml', 'w'
         )
 
@@ -53,17 +85,34 @@ def test_parse_arguments_with_file_name():
 
 
 def test_run_tests():
-    mock_log = MagicMock()
+    mock_log = _mock_log()
     with patch('subprocess.Popen') as mock_popen:
         mock_popen.return_value.wait.return_value = 0
         assert run_tests(mock_log, False) is True
+        mock_popen.assert_called_once()
+
+
+def test_run_tests_in_process(monkeypatch):
+    mock_log = _mock_log()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    monkeypatch.setattr('sys.stdout', stdout)
+    monkeypatch.setattr('sys.stderr', stderr)
 
+    def fake_ktest(**kwargs):
+        # Mimic ktest, which "restores" the process-wide streams
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        return 0
 
-def test_process_files():
-    mock_repo = MagicMock()
-    mock_args = MagicMock()
-    mock_log = MagicMock()
-    mock_litellm = MagicMock()
+    with patch('klingon_tools.ktest.ktest', side_effect=fake_ktest):
+        assert run_tests(mock_log, False, in_process=True) is True
+    assert sys.stdout is stdout
+    assert sys.stderr is stderr
+
+
+def test_process_files(mock_repo):
+    mock_args = _mock_args()
+    mock_log = _mock_log()
+    mock_litellm = _mock_litellm()
     with patch('os.path.exists', return_value=True):
         result = process_files(
             ['file1.py'], mock_repo, mock_args, mock_log, mock_litellm
@@ -73,49 +122,83 @@ def test_process_files():
 
 def test_run_push_prep():
     """Test the run_push_prep function."""
-    mock_log = MagicMock()
+    mock_log = _mock_log()
     with patch('os.path.exists') as mock_exists, \
-            patch('builtins.open', create=True) as mock_open, \
+            patch('builtins.open', mock_open(read_data="push-prep:")), \
             patch('subprocess.run') as mock_run:
         mock_exists.return_value = True
-        mock_open.return_value.__enter__.return_value.read.return_value = (
-            "push-prep:"
-        )
         run_push_prep(mock_log)
         mock_run.assert_called_once_with(['make', 'push-prep'], check=True)
 
 
-def test_workflow_process_file():
+@pytest.mark.parametrize(
+    "committed, dryrun, expect_commit",
+    [
+        pytest.param([], False, True, id="commit"),
+        pytest.param(['file1.py'], False, False, id="already-committed"),
+        pytest.param([], True, False, id="dryrun"),
+    ],
+)
+def test_workflow_process_file(mock_repo, committed, dryrun, expect_commit):
     """Test the workflow_process_file function."""
-    mock_repo = MagicMock()
-    mock_args = MagicMock()
-    mock_log = MagicMock()
-    mock_litellm = MagicMock()
-    mock_litellm.generate_commit_message_for_file.return_value = "feat: Add new feature"
+    mock_args = _mock_args(dryrun=dryrun)
+    mock_log = _mock_log()
+    mock_litellm = _mock_litellm()
+    mock_litellm.generate_commit_message_for_file.return_value = (
+        "feat: Add new feature"
+    )
     with patch('klingon_tools.push.git_pre_commit') as mock_pre_commit, \
             patch('klingon_tools.push.git_commit_file') as mock_commit, \
             patch('klingon_tools.push.validate_commit_message',
                   return_value=True), \
-            patch('klingon_tools.push.committed_not_pushed', new=[]):
+            patch('klingon_tools.push.committed_not_pushed', new=committed):
         mock_pre_commit.return_value = (True, None)
-        mock_args.dryrun = False
         current_modified_files = ['file1.py', 'file2.py']
         workflow_process_file(
             'file1.py', current_modified_files, mock_repo, mock_args,
             mock_log, mock_litellm, 1
         )
-        mock_commit.assert_called_once_with(
-            'file1.py', mock_repo, "feat: Add new feature"
-        )
+        if expect_commit:
+            mock_commit.assert_called_once_with(
+                'file1.py', mock_repo, "feat: Add new feature"
+            )
+        else:
+            mock_commit.assert_not_called()
+
+
+def test_find_git_root(tmp_path):
+    (tmp_path / '.git').mkdir()
+    nested = tmp_path / 'src' / 'pkg'
+    nested.mkdir(parents=True)
+    assert find_git_root(str(nested)) == str(tmp_path)
+    assert find_git_root(str(tmp_path.parent)) is None
+
+
+def test_find_git_root_relative_path(tmp_path, monkeypatch):
+    (tmp_path / '.git').mkdir()
+    (tmp_path / 'src').mkdir()
+    monkeypatch.chdir(tmp_path / 'src')
+    assert find_git_root('.') == str(tmp_path)
 
 
-def test_expand_file_patterns():
-    with patch('glob.glob') as mock_glob:
-        mock_glob.side_effect = [
-            ['file1.py', 'file2.py'], ['test1.txt', 'test2.txt']]
-        result = expand_file_patterns(['*.py', '*.txt'])
-        assert set(result) == {'file1.py', 'file2.py',
-                               'test1.txt', 'test2.txt'}
+def test_expand_file_patterns(tmp_path, monkeypatch):
+    for name in ['file1.py', 'file2.py', 'test1.txt', 'test2.txt',
+                 '.hidden.py', 'docs/guide.txt']:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+    monkeypatch.chdir(tmp_path)
+    result = expand_file_patterns(['*.py', '*.txt', 'd*/*.txt'])
+    assert set(result) == {'file1.py', 'file2.py', 'test1.txt', 'test2.txt',
+                           os.path.join('docs', 'guide.txt')}
+
+
+def test_expand_file_patterns_overlapping(tmp_path, monkeypatch):
+    for name in ['file1.py', 'file2.py']:
+        (tmp_path / name).touch()
+    monkeypatch.chdir(tmp_path)
+    result = expand_file_patterns(['file2.py', '*.py', 'file*.py'])
+    assert result[0] == 'file2.py'
+    assert sorted(result) == ['file1.py', 'file2.py']
 
 
 def test_filter_git_files():
@@ -125,135 +208,142 @@ def test_filter_git_files():
     assert result == ['file1.py', 'test1.txt']
 
 
+def test_filter_git_files_literal_brackets():
+    all_files = ['pages/i.tsx', 'pages/[id].tsx', 'pages/d.tsx']
+    result = filter_git_files(all_files, ['pages/[id].tsx'])
+    assert result == ['pages/[id].tsx']
+
+
 def test_run_tests_and_confirm():
-    mock_log = MagicMock()
+    mock_log = _mock_log()
     with patch('klingon_tools.push.run_tests') as mock_run_tests, \
             patch('builtins.input', return_value='y'):
         mock_run_tests.return_value = False
         assert run_tests_and_confirm(mock_log, False) is True
 
 
-def test_process_changes():
-    # Setup
-    mock_repo = MagicMock()
-    mock_args = MagicMock(oneshot=False)
-    mock_litellm = MagicMock()
-    mock_log_message = MagicMock()
-
-    # Mock the global variables
-    with patch('klingon_tools.push.untracked_files', ['file1.py']), \
-        patch('klingon_tools.push.modified_files', ['file2.py']), \
-        patch('klingon_tools.push.deleted_files', ['file3.py']), \
-        patch('klingon_tools.push.workflow_process_file') as mock_workflow, \
-        patch('klingon_tools.push.git_commit_deletes') as mock_commit_deletes, \
-        patch('klingon_tools.push.process_files') as mock_process_files, \
-            patch('klingon_tools.push.log_message', mock_log_message):
-
-        # Set return values
-        mock_process_files.return_value = True
-
-        # Execute
-        result = process_changes(mock_repo, mock_args, mock_litellm)
-
-        # Assert
-        assert result is True
-        mock_commit_deletes.assert_called_once_with(
-            mock_repo, ['file3.py']
+@pytest.fixture
+def push_patches():
+    """Patch the helpers that process_changes calls."""
+    with patch.multiple(
+        'klingon_tools.push',
+        git_get_status=DEFAULT,
+        git_commit_deletes=DEFAULT,
+        workflow_process_file=DEFAULT,
+        process_files=DEFAULT,
+        log_message=DEFAULT,
+    ) as mocks:
+        mocks['process_files'].return_value = True
+        yield types.SimpleNamespace(**mocks)
+
+
+@pytest.mark.parametrize(
+    "changes, oneshot, processed, expected",
+    [
+        pytest.param(
+            GitChanges(untracked=('file1.py',), modified=('file2.py',),
+                       deleted=('file3.py',)),
+            False, ['file1.py', 'file2.py'], True, id="with-changes",
+        ),
+        pytest.param(
+            GitChanges(untracked=('.pre-commit-config.yaml', 'file1.py'),
+                       modified=('file2.py',)),
+            False, ['file1.py', 'file2.py'], True, id="pre-commit-config",
+        ),
+        pytest.param(
+            GitChanges(untracked=('file1.py',), modified=('file2.py',)),
+            True, ['file1.py'], True, id="oneshot",
+        ),
+        pytest.param(GitChanges(), False, None, False, id="no-changes"),
+    ],
+)
+def test_process_changes(
+    push_patches, mock_repo, changes, oneshot, processed, expected
+):
+    mock_args = _mock_args(oneshot=oneshot)
+    mock_litellm = _mock_litellm()
+    # process_changes re-reads the status after committing the deletes
+    push_patches.git_get_status.return_value = (
+        [], list(changes.untracked), list(changes.modified), [], []
+    )
+
+    result = process_changes(mock_repo, mock_args, mock_litellm, changes)
+
+    assert result is expected
+    if changes.deleted:
+        push_patches.git_commit_deletes.assert_called_once_with(
+            mock_repo, list(changes.deleted)
         )
-        mock_process_files.assert_called_once_with(
-            ['file1.py', 'file2.py'], mock_repo, mock_args, mock_log_message,
+    else:
+        push_patches.git_commit_deletes.assert_not_called()
+    if '.pre-commit-config.yaml' in changes.untracked:
+        push_patches.workflow_process_file.assert_called_once_with(
+            '.pre-commit-config.yaml', ['.pre-commit-config.yaml'],
+            mock_repo, mock_args, push_patches.log_message, mock_litellm, 0
+        )
+    else:
+        push_patches.workflow_process_file.assert_not_called()
+    if processed is None:
+        push_patches.process_files.assert_not_called()
+    else:
+        push_patches.process_files.assert_called_once_with(
+            processed, mock_repo, mock_args, push_patches.log_message,
             mock_litellm
         )
 
-    # Test with .pre-commit-config.yaml
-    with patch('klingon_tools.push.untracked_files',
-               ['.pre-commit-config.yaml', 'file1.py']), \
-        patch('klingon_tools.push.modified_files', ['file2.py']), \
-        patch('klingon_tools.push.deleted_files', []), \
-        patch('klingon_tools.push.workflow_process_file') as mock_workflow, \
-        patch('klingon_tools.push.process_files') as mock_process_files, \
-            patch('klingon_tools.push.log_message', mock_log_message):
-
-        mock_process_files.return_value = True
-
-        result = process_changes(mock_repo, mock_args, mock_litellm)
 
-        assert result is True
-        mock_workflow.assert_called_once_with(
-            '.pre-commit-config.yaml', ['.pre-commit-config.yaml'], mock_repo,
-            mock_args, mock_log_message, mock_litellm, 0
-        )
-        mock_process_files.assert_called_once_with(
-            ['file1.py', 'file2.py'], mock_repo, mock_args,
-            mock_log_message, mock_litellm
+def test_startup_tasks(monkeypatch):
+    calls = []
+    for name in ['cleanup_lock_file', 'ensure_pre_commit_config',
+                 'run_push_prep', 'check_software_requirements']:
+        monkeypatch.setattr(
+            f'klingon_tools.push.{name}',
+            lambda *a, name=name, **k: calls.append(name)
         )
+    monkeypatch.setattr('klingon_tools.push.find_git_root',
+                        lambda path: os.getcwd())
+    monkeypatch.setattr('klingon_tools.push.get_git_user_info',
+                        lambda: ('John Doe', 'john@example.com'))
+    monkeypatch.setattr('klingon_tools.push.git_get_toplevel',
+                        lambda: types.SimpleNamespace())
+    args = argparse.Namespace(repo_path='.')
 
-    # Test oneshot mode
-    mock_args.oneshot = True
-    with patch('klingon_tools.push.untracked_files', ['file1.py']), \
-            patch('klingon_tools.push.modified_files', ['file2.py']), \
-            patch('klingon_tools.push.deleted_files', []), \
-            patch('klingon_tools.push.process_files') as mock_process_files, \
-            patch('klingon_tools.push.log_message', mock_log_message):
+    _, user_name, user_email = startup_tasks(args)
 
-        mock_process_files.return_value = True
+    assert user_name == 'John Doe'
+    assert user_email == 'john@example.com'
+    assert calls == ['cleanup_lock_file', 'ensure_pre_commit_config',
+                     'run_push_prep', 'check_software_requirements']
 
-        result = process_changes(mock_repo, mock_args, mock_litellm)
 
-        assert result is True
-        mock_process_files.assert_called_once_with(
-            ['file1.py'], mock_repo, mock_args, mock_log_message,
-            mock_litellm)
-
-    # Test with no changes
-    mock_args.oneshot = False
-    with patch('klingon_tools.push.untracked_files', []), \
-            patch('klingon_tools.push.modified_files', []), \
-            patch('klingon_tools.push.deleted_files', []), \
-            patch('klingon_tools.push.process_files') as mock_process_files, \
-            patch('klingon_tools.push.log_message', mock_log_message):
-
-        result = process_changes(mock_repo, mock_args, mock_litellm)
-
-        assert result is False
-        mock_process_files.assert_not_called()
-
-
-def test_startup_tasks():
-    mock_args = MagicMock()
-    with patch('klingon_tools.push.find_git_root') as mock_find_root, \
-            patch('klingon_tools.push.get_git_user_info') as mock_get_user, \
-            patch('klingon_tools.push.git_get_toplevel') as mock_get_toplevel:
-        mock_find_root.return_value = os.getcwd()
-        mock_get_user.return_value = ('John Doe', 'john@example.com')
-        mock_get_toplevel.return_value = MagicMock()
-        _, user_name, user_email = startup_tasks(mock_args)
-        assert user_name == 'John Doe'
-        assert user_email == 'john@example.com'
-
-
-def test_main():
+def test_main(monkeypatch):
     """Test the main function."""
-    with patch('klingon_tools.push.parse_arguments') as mock_parse, \
-            patch('klingon_tools.push.expand_file_patterns') as mock_expand, \
-            patch('klingon_tools.push.startup_tasks') as mock_startup, \
-            patch('klingon_tools.push.git_get_status') as mock_get_status, \
-            patch('klingon_tools.push.process_changes') as mock_process:
-        mock_parse.return_value = MagicMock(
-            models_list=False, no_tests=True, file_name=['*.py']
-        )
-        mock_startup.return_value = (
-            MagicMock(), 'John Doe', 'john@example.com'
-        )
-        mock_get_status.return_value = (
-            [], [], ['file1.py', 'file2.txt'], [], []
-        )
-        mock_expand.return_value = ['file1.py']
-        mock_process.return_value = True
-        assert main() == 0
-        mock_process.assert_called_once()
-        args, _ = mock_process.call_args
-        assert args[1].file_name == ['*.py']
+    calls = []
+    monkeypatch.setattr(
+        'sys.argv', ['push', '--no-tests', '--file-name', '*.py']
+    )
+    monkeypatch.setattr(
+        'klingon_tools.push.startup_tasks',
+        lambda args: (types.SimpleNamespace(), 'John Doe', 'john@example.com')
+    )
+    monkeypatch.setattr(
+        'klingon_tools.push.git_get_status',
+        lambda repo: ([], [], ['file1.py', 'file2.txt'], [], [])
+    )
+    monkeypatch.setattr('klingon_tools.push.expand_file_patterns',
+                        lambda patterns: ['file1.py'])
+    monkeypatch.setattr(
+        'klingon_tools.push.process_changes',
+        lambda *a: calls.append(a) or True
+    )
+    monkeypatch.setattr('klingon_tools.push.push_changes_if_needed',
+                        lambda repo, args: None)
+
+    assert main() == 0
+    assert len(calls) == 1
+    _, args, _, changes = calls[0]
+    assert args.file_name == ['*.py']
+    assert changes.modified == ('file1.py',)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,39 @@
+"""Benchmarks for the file-list helpers used by push.
+
+These pin the cost of expanding and filtering file lists on a repository
+sized working tree, so a change that makes either helper quadratic shows up
+in the benchmark table. The module is skipped when pytest-benchmark is not
+installed and deselected by default through the ``perf`` marker; save a
+baseline with ``make test-benchmark`` and check against it with ``make
+test-benchmark-compare``, which fails on a mean regression of over 10%.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from klingon_tools.push import (  # noqa: E402
+    expand_file_patterns,
+    filter_git_files,
+)
+
+pytestmark = pytest.mark.perf
+
+_PATHS = [f"src/module_{i}.py" for i in range(1000)]
+
+
+def test_expand_file_patterns_benchmark(benchmark, tmp_path, monkeypatch):
+    """Benchmark expanding 100 patterns that each match 1,000 files."""
+    (tmp_path / "src").mkdir()
+    for path in _PATHS:
+        (tmp_path / path).touch()
+    monkeypatch.chdir(tmp_path)
+    result = benchmark(expand_file_patterns, ["src/*.py"] * 100)
+    assert len(result) == len(_PATHS)
+
+
+def test_filter_git_files_benchmark(benchmark):
+    """Benchmark keeping 100 named files out of a 1,000 file status."""
+    filter_files = _PATHS[::10]
+    result = benchmark(filter_git_files, _PATHS, filter_files)
+    assert result == filter_files
@@ -8,10 +8,41 @@ configuration in package.json and pyproject.toml files.
 
 import os
 import json
-import toml
+import re
 from typing import Dict, Any
 import pytest
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+    import toml
+
+# Semantic Versioning regex pattern
+_SEMVER = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+
+
+@pytest.fixture(scope="module")
+def package_json() -> Dict[str, Any]:
+    """Parse package.json once for every test in this module."""
+    with open("package.json", "r") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def pyproject() -> Dict[str, Any]:
+    """Parse pyproject.toml once for every test in this module."""
+    if tomllib is None:
+        with open("pyproject.toml", "r") as f:
+            return toml.load(f)
+    with open("pyproject.toml", "rb") as f:
+        return tomllib.load(f)
+
 
 def test_package_json_exists() -> None:
     """Test if package.json file exists.
@@ -31,9 +62,7 @@ def test_pyproject_toml_exists() -> None:
     assert os.path.exists("pyproject.toml"), "pyproject.toml does not exist"
 
 
-import re
-
-def test_package_json_version() -> None:
+def test_package_json_version(package_json: Dict[str, Any]) -> None:
     """Test if package.json contains a valid version.
 
     Assertions:
@@ -41,19 +70,15 @@ def test_package_json_version() -> None:
     2. Verify that the "version" value is a string.
     3. Ensure that the version string follows semantic versioning format.
     """
-    with open("package.json", "r") as f:
-        data = json.load(f)
+    data = package_json
 
     assert "version" in data, "version key not found in package.json"
     assert isinstance(data["version"], str), "version in package.json is not a string"
 
-    # Semantic Versioning regex pattern
-    semver_pattern = r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
-
-    assert re.match(semver_pattern, data["version"]), f"Version '{data['version']}' does not follow semantic versioning format"
+    assert _SEMVER.match(data["version"]), f"Version '{data['version']}' does not follow semantic versioning format"
 
 
-def test_pyproject_toml_version() -> None:
+def test_pyproject_toml_version(pyproject: Dict[str, Any]) -> None:
     """Test if pyproject.toml contains valid semantic release configuration.
 
     Assertions:
@@ -66,11 +91,8 @@ def test_pyproject_toml_version() -> None:
     "pyproject.toml:version".
     6. Ensure that the file specified in the "version_variable" exists.
     """
-    with open("pyproject.toml", "r") as f:
-        data = toml.load(f)
-
-    assert_pyproject_structure(data)
-    assert_version_variable(data)
+    assert_pyproject_structure(pyproject)
+    assert_version_variable(pyproject)
 
 
 def assert_pyproject_structure(data: Dict[str, Any]) -> None: